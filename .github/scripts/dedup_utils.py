@@ -3,20 +3,39 @@
 Deduplication utilities for the job tracker.
 Handles URL normalization, dedup key generation, and data processing.
 """
-from urllib.parse import urlparse
+from functools import lru_cache
 from datetime import datetime
 
 
+@lru_cache(maxsize=200000)
+def _normalize_url_cached(url):
+    """Cached worker for normalize_url; expects a non-empty string"""
+    url = url.strip()
+    # Most listing URLs are already lowercase; skip the extra copy for those
+    if not url.islower():
+        url = url.lower()
+    # Keep scheme, netloc (host), and path; drop fragment and query.
+    # Plain str.partition avoids building a full urlparse() ParseResult.
+    # Unlike urlparse, ";params" on the last path segment are kept as part of
+    # the path (e.g. ".../job;jsessionid=x"), so such URLs key separately.
+    url, _, _ = url.partition('#')
+    url, _, _ = url.partition('?')
+    return url.rstrip('/')
+
+
+@lru_cache(maxsize=65536)
+def _lower_strip(s):
+    """Cached lower().strip() for company/title strings that repeat across items"""
+    return s.lower().strip()
+
+
 def normalize_url(url):
     """Normalize URL to scheme+host+path for deduplication"""
     if not url:
         return None
-    try:
-        parsed = urlparse(url.strip().lower())
-        # Keep scheme, netloc (host), and path; drop query and fragment
-        return f"{parsed.scheme}://{parsed.netloc}{parsed.path}".rstrip('/')
-    except Exception:
-        return url
+    # Same URLs recur across repos and commits, so skip re-parsing them.
+    # str() keeps non-str values (ints, stray lists) from raising in the cache/strip.
+    return _normalize_url_cached(str(url))
 
 
 def get_primary_url(item):
@@ -36,14 +55,48 @@ def get_dedup_key(item):
         return ("id", item["id"])
     
     # Final fallback to company+title combination
-    company = (item.get("company_name", "") or "").lower().strip()
-    title = (item.get("title", "") or "").lower().strip()
+    company = _lower_strip(item.get("company_name", "") or "")
+    title = _lower_strip(item.get("title", "") or "")
     if company and title:
         return ("company_title", (company, title))
     
     return None
 
 
+def claim_dedup_key(item, seen_urls, seen_ids, seen_company_titles):
+    """
+    Record an item's dedup identity, returning True the first time it is seen.
+    
+    Same priority as get_dedup_key (normalized_url -> id -> company+title), but
+    keeps one set per key kind so the common URL case hashes a plain str
+    instead of allocating a tagged tuple per item. Items with no usable key
+    return False, matching callers that skip keyless items.
+    """
+    norm_url = normalize_url(get_primary_url(item))
+    if norm_url:
+        if norm_url in seen_urls:
+            return False
+        seen_urls.add(norm_url)
+        return True
+    
+    item_id = item.get("id")
+    if item_id:
+        if item_id in seen_ids:
+            return False
+        seen_ids.add(item_id)
+        return True
+    
+    company = _lower_strip(item.get("company_name", "") or "")
+    title = _lower_strip(item.get("title", "") or "")
+    if company and title:
+        if (company, title) in seen_company_titles:
+            return False
+        seen_company_titles.add((company, title))
+        return True
+    
+    return False
+
+
 def get_unified_season(item):
     """Get unified season label: season field or first term or empty string"""
     # SimplifyJobs uses 'season' field, Vansh uses 'terms' array
@@ -57,10 +110,20 @@ def get_unified_season(item):
 
 def to_epoch(v):
     """Convert value to epoch timestamp"""
+    # Fast path: listings store epochs as JSON ints
+    if type(v) is int:
+        return v
     try:
+        if isinstance(v, str) and not v.strip().lstrip('+-').isdigit():
+            # Non-digit strings are usually ISO dates: parse those first instead of
+            # letting int() raise on them. int() below still accepts e.g. "1_000".
+            try:
+                return int(datetime.fromisoformat(v).timestamp())
+            except ValueError:
+                pass
         return int(v)
     except Exception:
         try:
             return int(datetime.fromisoformat(str(v)).timestamp())
         except Exception:
-            return -1
\ No newline at end of file
+            return -1
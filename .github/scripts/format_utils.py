@@ -3,6 +3,18 @@
 Formatting utilities for job listing display.
 Includes location formatting logic for different notification modes.
 """
+import re
+
+# DM location keywords compiled into one multi-pattern matcher. Group index is the
+# priority (1=California, 2=New York, 3=New Jersey). The lookahead lets matches
+# overlap so e.g. "nyc" cannot hide a following "ca". The NY token check avoids
+# substring false-positives like 'Albany'.
+_DM_LOCATION_LABELS = ("California", "New York", "New Jersey")
+_DM_LOCATION_RE = re.compile(
+    r"(?=(california|ca)"
+    r"|(new york city|new york|nyc|(?:^|[\s,(/-])ny\b)"
+    r"|(new jersey|nj))"
+)
 
 def format_location(locations, mode="digest"):
     """
@@ -25,8 +37,8 @@ def format_location(locations, mode="digest"):
     if not locations or not isinstance(locations, list):
         return ""
     
-    # Filter out empty/None locations
-    valid_locations = [loc.strip() for loc in locations if loc and str(loc).strip()]
+    # Filter out empty/None locations (strip each entry once)
+    valid_locations = [s for s in (str(loc).strip() for loc in locations if loc) if s]
     
     if not valid_locations:
         return ""
@@ -40,25 +52,16 @@ def format_location(locations, mode="digest"):
         return "Multi-location"
     
     elif mode == "dm":
-        # Check for CA/California first
-        for loc in valid_locations:
-            loc_lower = loc.lower()
-            if "ca" in loc_lower or "california" in loc_lower:
-                return "California"
-        
-        # Check for New York (avoid substring false-positives like 'Albany')
-        import re
+        # Single scan per location; the lowest priority index wins (CA > NY > NJ)
+        best = len(_DM_LOCATION_LABELS)
         for loc in valid_locations:
-            loc_lower = loc.lower()
-            if ("new york city" in loc_lower or "new york" in loc_lower or "nyc" in loc_lower or
-                re.search(r"(^|[\s,(/-])ny(\b|[)\s,-])", loc_lower)):
-                return "New York"
+            for match in _DM_LOCATION_RE.finditer(loc.lower()):
+                best = min(best, match.lastindex - 1)
+                if best == 0:
+                    return _DM_LOCATION_LABELS[0]  # California can't be beaten
         
-        # Check for NJ/New Jersey
-        for loc in valid_locations:
-            loc_lower = loc.lower()
-            if "nj" in loc_lower or "new jersey" in loc_lower:
-                return "New Jersey"
+        if best < len(_DM_LOCATION_LABELS):
+            return _DM_LOCATION_LABELS[best]
         
         # Default for multi-location in DM mode
         return "Multi-location"
@@ -6,10 +6,14 @@ Handles the issue where GitHub Contents API may return empty content for large f
 by implementing multiple fallback strategies.
 """
 import os
-import json
 import base64
+import hashlib
+import pathlib
 import requests
 from datetime import datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from json_utils import json_loads
 
 # GitHub API configuration
 GH = "https://api.github.com"
@@ -17,6 +21,24 @@ HEADERS = {
     "Authorization": f"Bearer {os.getenv('GH_TOKEN', '')}",
     "Accept": "application/vnd.github+json",
 }
+# Contents API returns the file body directly with this media type
+RAW_HEADERS = {**HEADERS, "Accept": "application/vnd.github.raw"}
+
+# Shared session so repeated API calls reuse pooled keep-alive connections
+# instead of paying a fresh TLS handshake per request. The pool is sized for the
+# concurrent per-repo fetches; transient 429/5xx responses are retried with backoff
+# (raise_on_status=False hands the last response back so raise_for_status still
+# produces the usual HTTPError).
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 502, 503, 504), raise_on_status=False),
+))
+
+# On-disk ETag cache for branch/default-ref file fetches. Lives under STATE_DIR so
+# it is persisted between scheduled runs by the workflow state cache.
+ETAG_CACHE_DIR = pathlib.Path(os.getenv("STATE_DIR", ".state")) / "etag_cache"
 
 _LEVEL_ORDER = {"DEBUG": 10, "INFO": 20, "WARN": 30, "ERROR": 40}
 _PREFIX_LEVELS = {
@@ -43,6 +65,7 @@ _PREFIX_LEVELS = {
 _LOG_LEVEL_NAME = os.getenv("WATCHER_LOG_LEVEL", "INFO").upper()
 if _LOG_LEVEL_NAME not in _LEVEL_ORDER:
     _LOG_LEVEL_NAME = "INFO"
+_LOG_THRESHOLD = _LEVEL_ORDER[_LOG_LEVEL_NAME]
 
 
 def _resolve_level(msg: str) -> str:
@@ -54,22 +77,56 @@ def _resolve_level(msg: str) -> str:
     return "DEBUG"
 
 
-def debug_log(msg):
-    """Lightweight logging with configurable verbosity via WATCHER_LOG_LEVEL."""
+def debug_log(msg, *args):
+    """Lightweight logging with configurable verbosity via WATCHER_LOG_LEVEL.
+    
+    Like stdlib logging, optional %-style args are only formatted when the
+    message passes the level check.
+    """
+    # Unprefixed messages are always DEBUG; drop them without parsing a prefix
+    if _LOG_THRESHOLD > _LEVEL_ORDER["DEBUG"] and not msg.startswith("["):
+        return
     level = _resolve_level(msg)
-    if _LEVEL_ORDER[level] < _LEVEL_ORDER[_LOG_LEVEL_NAME]:
+    if _LEVEL_ORDER[level] < _LOG_THRESHOLD:
         return
+    if args:
+        msg = msg % args
     print(f"[{datetime.now().isoformat()}] {level}: {msg}")
 
 def gh_get(url, **params):
     """Call GitHub API and return parsed JSON, raising on HTTP errors"""
-    r = requests.get(url, headers=HEADERS, params=params, timeout=30)
+    r = _SESSION.get(url, headers=HEADERS, params=params, timeout=30)
     r.raise_for_status()
     return r.json()
 
-def fetch_file_content(repo, path, ref=None):
+def _etag_cache_paths(repo, path, ref):
+    """Return (etag_file, body_file) cache locations for a repo:path@ref"""
+    name = hashlib.sha1(f"{repo}:{path}@{ref or ''}".encode("utf-8")).hexdigest()
+    return ETAG_CACHE_DIR / f"{name}.etag", ETAG_CACHE_DIR / f"{name}.body"
+
+def _load_etag_cache(repo, path, ref):
+    """Return (etag, body) from the on-disk cache, or (None, None) if missing"""
+    etag_file, body_file = _etag_cache_paths(repo, path, ref)
+    try:
+        if etag_file.exists() and body_file.exists():
+            return etag_file.read_text().strip(), body_file.read_bytes()
+    except Exception as e:
+        debug_log("ETag cache read failed for %s:%s: %s", repo, path, e)
+    return None, None
+
+def _save_etag_cache(repo, path, ref, etag, body):
+    """Persist the ETag and body for a repo:path@ref; failures are non-fatal"""
+    etag_file, body_file = _etag_cache_paths(repo, path, ref)
+    try:
+        ETAG_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        body_file.write_bytes(body)
+        etag_file.write_text(etag)
+    except Exception as e:
+        debug_log("ETag cache write failed for %s:%s: %s", repo, path, e)
+
+def fetch_file_bytes(repo, path, ref=None):
     """
-    Fetch file content from GitHub repo with robust fallback strategies.
+    Fetch raw file bytes from GitHub repo with robust fallback strategies.
     
     Args:
         repo: Repository in format "owner/repo"
@@ -77,71 +134,126 @@ def fetch_file_content(repo, path, ref=None):
         ref: Git reference (branch, tag, SHA). Defaults to repo's default branch.
     
     Returns:
-        str: File content as text
+        bytes: Undecoded file content
         
     Raises:
+        FileNotFoundError: If the path does not exist at ref
         RuntimeError: If all fallback strategies fail
     """
-    debug_log(f"Fetching {repo}:{path} (ref={ref or 'default'})")
+    debug_log("Fetching %s:%s (ref=%s)", repo, path, ref or 'default')
     
-    # Strategy 1: Contents API with base64 decoding
-    try:
-        # Detect if ref is a commit SHA (40-character hex string) vs branch name
-        if ref:
-            # If ref looks like a commit SHA (40-char hex), use it directly
-            if len(ref) == 40 and all(c in '0123456789abcdef' for c in ref.lower()):
-                params = {"ref": ref}
-            else:
-                # Assume it's a branch name and add heads/ prefix
-                params = {"ref": f"heads/{ref}"}
+    # Detect if ref is a commit SHA (40-character hex string) vs branch name
+    if ref:
+        # If ref looks like a commit SHA (40-char hex), use it directly
+        if len(ref) == 40 and all(c in '0123456789abcdef' for c in ref.lower()):
+            params = {"ref": ref}
         else:
-            params = {}
-        
+            # Assume it's a branch name and add heads/ prefix
+            params = {"ref": f"heads/{ref}"}
+    else:
+        params = {}
+    
+    # Commit SHAs are immutable and numerous, so only branch/default refs use the ETag cache
+    use_etag = "ref" not in params or params["ref"].startswith("heads/")
+    cached_etag, cached_body = _load_etag_cache(repo, path, ref) if use_etag else (None, None)
+    
+    # Strategy 1: Contents API with raw media type (no JSON envelope, no base64)
+    raw_status = None
+    try:
+        headers = RAW_HEADERS
+        if cached_etag:
+            headers = {**RAW_HEADERS, "If-None-Match": cached_etag}
+        r = _SESSION.get(
+            f"{GH}/repos/{repo}/contents/{path}",
+            headers=headers, params=params, timeout=30
+        )
+        raw_status = r.status_code
+        if r.status_code == 304 and cached_body is not None:
+            debug_log("Raw contents not modified: %s cached bytes for %s:%s", len(cached_body), repo, path)
+            return cached_body
+        if r.status_code == 200:
+            content = r.content
+            debug_log("Raw contents success: %s bytes from %s:%s", len(content), repo, path)
+            if use_etag and r.headers.get("ETag"):
+                _save_etag_cache(repo, path, ref, r.headers["ETag"], content)
+            return content
+        debug_log("Raw contents returned %s for %s:%s, falling back to JSON envelope", r.status_code, repo, path)
+    except Exception as e:
+        debug_log("Raw contents failed for %s:%s: %s", repo, path, e)
+    
+    # A 404 means the path/ref doesn't exist; the envelope strategies would 404 too
+    if raw_status == 404:
+        raise FileNotFoundError(f"File not found: {repo}:{path} (ref={ref or 'default'})")
+    
+    # Strategy 2: Contents API with base64 decoding
+    try:
         data = gh_get(f"{GH}/repos/{repo}/contents/{path}", **params)
         
         if isinstance(data, dict):
             # Check for base64 encoded content
             if data.get("encoding") == "base64" and data.get("content"):
-                content = base64.b64decode(data["content"]).decode("utf-8")
-                debug_log(f"Contents API success: {len(content)} bytes from {repo}:{path}")
+                content = base64.b64decode(data["content"])
+                debug_log("Contents API success: %s bytes from %s:%s", len(content), repo, path)
                 return content
             
             # Check for direct content
             if "content" in data and data["content"]:
-                content = data["content"]
-                debug_log(f"Contents API success: {len(content)} bytes from {repo}:{path}")
+                content = data["content"].encode("utf-8")
+                debug_log("Contents API success: %s bytes from %s:%s", len(content), repo, path)
                 return content
             
-            # Strategy 2: Use download_url if available
+            # Strategy 3: Use download_url if available
             if "download_url" in data and data["download_url"]:
-                debug_log(f"Contents API returned empty content, trying download_url for {repo}:{path}")
-                r = requests.get(data["download_url"], timeout=30)
+                debug_log("Contents API returned empty content, trying download_url for %s:%s", repo, path)
+                r = _SESSION.get(data["download_url"], timeout=30)
                 r.raise_for_status()
-                content = r.text
-                debug_log(f"Download URL success: {len(content)} bytes from {repo}:{path}")
+                content = r.content
+                debug_log("Download URL success: %s bytes from %s:%s", len(content), repo, path)
                 return content
             
-            # Strategy 3: Git blobs API using SHA
+            # Strategy 4: Git blobs API using SHA
             if "sha" in data:
-                debug_log(f"Trying git blobs API with SHA {data['sha'][:8]} for {repo}:{path}")
-                blob_data = gh_get(f"{GH}/repos/{repo}/git/blobs/{data['sha']}")
-                if blob_data.get("encoding") == "base64" and blob_data.get("content"):
-                    content = base64.b64decode(blob_data["content"]).decode("utf-8")
-                    debug_log(f"Git blobs API success: {len(content)} bytes from {repo}:{path}")
+                debug_log("Trying git blobs API with SHA %s for %s:%s", data['sha'][:8], repo, path)
+                # Raw media type streams the blob bytes (up to 100MB) without a base64 envelope
+                r = _SESSION.get(f"{GH}/repos/{repo}/git/blobs/{data['sha']}", headers=RAW_HEADERS, timeout=30)
+                r.raise_for_status()
+                if r.content:
+                    content = r.content
+                    debug_log("Git blobs API success: %s bytes from %s:%s", len(content), repo, path)
                     return content
         
-        debug_log(f"Contents API returned unexpected structure for {repo}:{path}")
+        debug_log("Contents API returned unexpected structure for %s:%s", repo, path)
     
     except Exception as e:
-        debug_log(f"Contents API failed for {repo}:{path}: {e}")
+        debug_log("Contents API failed for %s:%s: %s", repo, path, e)
     
     # All strategies failed
     raise RuntimeError(f"Failed to fetch content from {repo}:{path} using all available strategies")
 
+def fetch_file_content(repo, path, ref=None):
+    """
+    Fetch file content from GitHub repo with robust fallback strategies.
+    
+    Args:
+        repo: Repository in format "owner/repo"
+        path: File path within the repository
+        ref: Git reference (branch, tag, SHA). Defaults to repo's default branch.
+    
+    Returns:
+        str: File content as text
+        
+    Raises:
+        RuntimeError: If all fallback strategies fail
+    """
+    return fetch_file_bytes(repo, path, ref).decode("utf-8")
+
 def fetch_file_json(repo, path, ref=None):
     """
     Fetch and parse JSON file from GitHub repo.
     
+    Parses the raw bytes directly so large listings files skip the
+    intermediate decoded str copy.
+    
     Args:
         repo: Repository in format "owner/repo"
         path: File path within the repository
@@ -151,15 +263,16 @@ def fetch_file_json(repo, path, ref=None):
         Any: Parsed JSON data
         
     Raises:
+        FileNotFoundError: If the path does not exist at ref
         RuntimeError: If file cannot be fetched
-        json.JSONDecodeError: If content is not valid JSON
+        ValueError: If content is not valid UTF-8 JSON
     """
-    content = fetch_file_content(repo, path, ref)
+    content = fetch_file_bytes(repo, path, ref)
     try:
-        data = json.loads(content)
-        debug_log(f"JSON parse success: {len(data) if isinstance(data, list) else 'object'} items from {repo}:{path}")
+        data = json_loads(content)
+        debug_log("JSON parse success: %s items from %s:%s", len(data) if isinstance(data, list) else 'object', repo, path)
         return data
-    except json.JSONDecodeError as e:
-        debug_log(f"JSON parse failed for {repo}:{path}: {e}")
-        debug_log(f"Content preview (first 200 chars): {content[:200]}")
+    except ValueError as e:
+        debug_log("JSON parse failed for %s:%s: %s", repo, path, e)
+        debug_log("Content preview (first 200 chars): %s", content[:200].decode('utf-8', errors='replace'))
         raise
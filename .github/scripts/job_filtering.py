@@ -5,6 +5,7 @@ Handles category-based filtering for different use cases (DM alerts vs digest).
 """
 
 import re
+from functools import lru_cache
 from state_utils import should_include_item
 from github_helper import debug_log
 
@@ -45,6 +46,10 @@ ALLOWED_CATEGORIES_DM = {
     "Data Science, AI & Machine Learning"
 }
 
+# Lowercased lookup tables so case-insensitive matches are a single dict probe
+_SIMPLIFY_CATEGORY_MAPPING_LOWER = {k.lower(): v for k, v in SIMPLIFY_CATEGORY_MAPPING.items()}
+_ALLOWED_CATEGORIES_DM_LOWER = {c.lower(): c for c in ALLOWED_CATEGORIES_DM}
+
 # Category filtering for digest: allow several categories, exclude "Other"
 ALLOWED_CATEGORIES_DIGEST = {
     "Software Engineering",
@@ -54,6 +59,56 @@ ALLOWED_CATEGORIES_DIGEST = {
     "Product Management",
 }
 
+# Title keywords used when a job has no usable category field.
+# Data Science & AI & Machine Learning (first priority for overlapping terms)
+# Includes common abbreviations: ML, NLP, CV
+DATA_ML_TITLE_TERMS = (
+    "data science", "data scientist", "data engineer", "data eng",
+    "artificial intelligence", "ai engineer", "ai researcher", "ai &",
+    "machine learning", "ml engineer", "ml researcher",
+    "data analytics", "data analyst",
+    "research engineer", "research eng", "research scientist", "research sci",
+    "nlp", "natural language", "computer vision", "cv engineer",
+    "deep learning", "neural network",
+)
+
+# Software Engineering (second priority)
+# Includes common abbreviations: SWE, SDE, full-stack variants
+SOFTWARE_TITLE_TERMS = (
+    "software engineer", "software eng", "swe", "sde",
+    "software developer", "software dev",
+    "product engineer",
+    "fullstack", "full-stack", "full stack",
+    "frontend", "front end", "front-end",
+    "backend", "back end", "back-end",
+    "founding engineer",
+    "mobile developer", "mobile dev", "mobile engineer",
+    "forward deployed", "forward-deployed",
+    "application developer", "app developer",
+)
+
+# Both term lists compiled into one multi-pattern matcher so each title is scanned
+# once instead of once per term. Group index is the priority (1=DS/ML, 2=SWE); the
+# lookahead lets matches overlap so a SWE hit can't swallow a later DS/ML term.
+_TITLE_CATEGORY_LABELS = ("Data Science, AI & Machine Learning", "Software Engineering")
+_TITLE_CATEGORY_RE = re.compile(
+    "(?=(" + "|".join(map(re.escape, DATA_ML_TITLE_TERMS)) + ")"
+    "|(" + "|".join(map(re.escape, SOFTWARE_TITLE_TERMS)) + "))"
+)
+
+# Explicit graduate-degree signals in a lowercased title, fused into one pattern:
+# - PhD/doctorate mentions (incl. "Ph.D." and "Current PhD")
+# - "Current MS/Masters" or MS/Masters + required/preferred/student/candidate(/degree)
+# - "Graduate Student", "Grad Student", "Graduate Researcher"
+# Generic "Graduate Internship" is deliberately not matched.
+_GRAD_DEGREE_RE = re.compile(
+    r"\bphd\b|ph\.d|\bdoctorate\b"
+    r"|\bcurrent\s+(?:ms|masters?|master'?s)\b"
+    r"|\bms\s+(?:required|preferred|student|candidate)\b"
+    r"|\bmaster(?:'?s)?\s+(?:required|preferred|student|candidate|degree)\b"
+    r"|\bgraduate\s+(?:student|researcher)\b|\bgrad\s+student\b"
+)
+
 
 def classify_job_category(job):
     """
@@ -73,53 +128,35 @@ def classify_job_category(job):
         
         # Try case-insensitive match for robustness
         category_lower = category.lower()
-        for key, value in SIMPLIFY_CATEGORY_MAPPING.items():
-            if key.lower() == category_lower:
-                debug_log(f"[CATEGORY-CASE-MATCH] Matched '{category}' → '{value}' (case-insensitive)")
-                return value
+        value = _SIMPLIFY_CATEGORY_MAPPING_LOWER.get(category_lower)
+        if value:
+            debug_log(f"[CATEGORY-CASE-MATCH] Matched '{category}' → '{value}' (case-insensitive)")
+            return value
             
         # Check if it's already in canonical form (case-insensitive)
-        for canonical in ALLOWED_CATEGORIES_DM:
-            if canonical.lower() == category_lower:
-                return canonical
+        canonical = _ALLOWED_CATEGORIES_DM_LOWER.get(category_lower)
+        if canonical:
+            return canonical
         
         # Category exists but not mappable - fall back to title classification
         # This handles cases where SimplifyJobs adds new categories or changes formatting
         debug_log(f"[CATEGORY-UNMAPPED] Unknown category '{category}' for job: {job.get('company_name', 'Unknown')} - {job.get('title', 'Unknown')[:50]}... | Falling back to title classification")
     
     # Fallback: classify by title if no category exists or category not mappable
-    title = job.get("title", "").lower()
-    
-    # Data Science & AI & Machine Learning (first priority for overlapping terms)
-    # Includes common abbreviations: ML, NLP, CV
-    data_ml_terms = [
-        "data science", "data scientist", "data engineer", "data eng",
-        "artificial intelligence", "ai engineer", "ai researcher", "ai &",
-        "machine learning", "ml engineer", "ml researcher",
-        "data analytics", "data analyst",
-        "research engineer", "research eng", "research scientist", "research sci",
-        "nlp", "natural language", "computer vision", "cv engineer",
-        "deep learning", "neural network"
-    ]
-    if any(term in title for term in data_ml_terms):
-        return "Data Science, AI & Machine Learning"
-    
-    # Software Engineering (second priority)
-    # Includes common abbreviations: SWE, SDE, full-stack variants
-    software_terms = [
-        "software engineer", "software eng", "swe", "sde",
-        "software developer", "software dev",
-        "product engineer",
-        "fullstack", "full-stack", "full stack",
-        "frontend", "front end", "front-end",
-        "backend", "back end", "back-end",
-        "founding engineer",
-        "mobile developer", "mobile dev", "mobile engineer",
-        "forward deployed", "forward-deployed",
-        "application developer", "app developer"
-    ]
-    if any(term in title for term in software_terms):
-        return "Software Engineering"
+    return _classify_title(job.get("title", "").lower())
+
+
+@lru_cache(maxsize=65536)
+def _classify_title(title):
+    """Classify a lowercased title; cached since titles repeat across listings/repos"""
+    # Single scan over the title; DS/ML hits take priority over SWE hits
+    best = None
+    for match in _TITLE_CATEGORY_RE.finditer(title):
+        best = match.lastindex if best is None else min(best, match.lastindex)
+        if best == 1:
+            break
+    if best is not None:
+        return _TITLE_CATEGORY_LABELS[best - 1]
     
     # Filter out other categories (Hardware, Quant, Product, Other, etc.)
     return None
@@ -140,38 +177,16 @@ def requires_graduate_degree(item):
         bool: True if the position explicitly requires MS/PhD
     """
     # Only title field is available in SimplifyJobs/vanshb03 data
-    title = (item.get("title") or "").lower()
-    
-    # Explicit PhD/doctorate mentions are the clearest signal
-    if re.search(r'\bphd\b', title) or re.search(r'ph\.d\.?', title) or re.search(r'\bdoctorate\b', title):
-        return True
-    
-    # "Current PhD" or "PhD Student" or "PhD Candidate"
-    if re.search(r'\bcurrent\s+phd\b', title):
-        return True
-    
-    # Masters/MS explicitly required or for MS students
-    masters_patterns = [
-        r'\bms\s+(required|preferred|student|candidate)\b',
-        r'\bmasters?\s+(required|preferred|student|candidate|degree)\b',
-        r"\bmaster'?s\s+(required|preferred|student|candidate|degree)\b",
-        r'\bcurrent\s+(ms|masters?|master\'?s)\b',
-    ]
-    if any(re.search(pattern, title) for pattern in masters_patterns):
-        return True
-    
-    # "Graduate Student" or "Grad Student" (not just "Graduate Internship")
-    if re.search(r'\bgraduate\s+student\b', title) or re.search(r'\bgrad\s+student\b', title):
-        return True
-    
-    # "Graduate Researcher" suggests advanced degree
-    if re.search(r'\bgraduate\s+researcher\b', title):
-        return True
-    
+    return _title_requires_graduate_degree((item.get("title") or "").lower())
+
+
+@lru_cache(maxsize=65536)
+def _title_requires_graduate_degree(title):
+    """Check a lowercased title for MS/PhD signals; cached since titles repeat"""
+    # Single precompiled scan for all explicit MS/PhD signals.
     # Note: We intentionally DO NOT filter generic "Graduate Internship" as these
     # programs often accept both undergrad and grad students (e.g., CVS Health)
-    
-    return False
+    return bool(_GRAD_DEGREE_RE.search(title))
 
 
 def should_process_repo_item(item, repo):
@@ -252,9 +267,9 @@ def is_allowed_category_for_digest(item, allowed_categories):
     
     # Try case-insensitive match
     cat_lower = cat.lower()
-    for key, value in SIMPLIFY_CATEGORY_MAPPING.items():
-        if key.lower() == cat_lower:
-            return value in allowed_categories
+    value = _SIMPLIFY_CATEGORY_MAPPING_LOWER.get(cat_lower)
+    if value:
+        return value in allowed_categories
     
     # Check if already canonical (case-insensitive)
     for allowed in allowed_categories:
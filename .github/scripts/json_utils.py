@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+JSON encode/decode helpers for the job tracker.
+
+Uses orjson when it is installed and falls back to the stdlib json module.
+"""
+import json
+
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is used when orjson isn't installed
+    orjson = None
+
+
+def json_loads(data):
+    """Parse JSON from bytes or str, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj):
+    """Serialize to indented UTF-8 JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode("utf-8")
@@ -3,30 +3,17 @@
 Fetch the latest listing from the target repository's listings file and send it via Telegram.
 Relies on env vars: TARGET_REPO, LISTINGS_PATH (default listings.json), GH_TOKEN, TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID
 """
-import os, json, base64, requests
+import os
+from datetime import datetime
+from github_helper import fetch_file_json
 from format_utils import format_location, format_job_line
+from telegram_utils import send_message
 
-GH = "https://api.github.com"
 TARGET_REPO = os.environ["TARGET_REPO"]
 LISTINGS_PATH = os.getenv("LISTINGS_PATH", "listings.json")
 DATE_FIELD = os.getenv("DATE_FIELD", "date_posted")
 DATE_FALLBACK = os.getenv("DATE_FALLBACK", "date_updated")
 MESSAGE_PREFIX = os.getenv("MESSAGE_PREFIX", "")  # Context prefix for messages
-HEADERS = {"Authorization": f"Bearer {os.getenv('GH_TOKEN','')}",
-           "Accept": "application/vnd.github+json"}
-
-def gh(url, **params):
-    r = requests.get(url, headers=HEADERS, params=params)
-    r.raise_for_status()
-    return r.json()
-
-def get_file(path: str, ref: str | None = None):
-    data = gh(f"{GH}/repos/{TARGET_REPO}/contents/{path}", ref=ref)  # default branch when ref None
-    if isinstance(data, dict) and data.get("encoding") == "base64":
-        return base64.b64decode(data["content"]).decode("utf-8")
-    if isinstance(data, dict) and "content" in data:
-        return data["content"]
-    raise RuntimeError("Unexpected response for contents API")
 
 def send_telegram(text: str):
     tok = os.getenv("TELEGRAM_BOT_TOKEN"); chat = os.getenv("TELEGRAM_CHAT_ID")
@@ -34,46 +21,47 @@ def send_telegram(text: str):
         print("Missing TELEGRAM_BOT_TOKEN or TELEGRAM_CHAT_ID")
         return False
         
-    r = requests.post(
-        f"https://api.telegram.org/bot{tok}/sendMessage",
-        json={"chat_id": chat, "text": text, "disable_web_page_preview": True}
-    )
-    print("Telegram status:", r.status_code, r.text)
-    return r.ok
+    ok, status, body = send_message(tok, chat, text)
+    print("Telegram status:", status, body)
+    return ok
 
-def main():
+def to_epoch(v) -> int:
+    """Convert a date value to epoch seconds (int-like or ISO-8601); -1 on failure"""
     try:
-        txt = get_file(LISTINGS_PATH)
-    except Exception as e:
-        print("Failed to fetch listings file:", e)
-        return 1
+        return int(v)
+    except Exception:
+        # Try parse string timestamp (ISO8601 or date)
+        try:
+            return int(datetime.fromisoformat(str(v)).timestamp())
+        except Exception:
+            return -1
 
+def main():
+    # Parse the raw bytes directly (orjson when installed) instead of decode + json.loads
     try:
-        data = json.loads(txt)
-    except Exception as e:
+        data = fetch_file_json(TARGET_REPO, LISTINGS_PATH)
+    except ValueError as e:
         print("JSON parse error:", e)
         return 1
+    except Exception as e:
+        print("Failed to fetch listings file:", e)
+        return 1
 
     if not isinstance(data, list) or not data:
         print("No listings found in", LISTINGS_PATH)
         return 0
 
-    # Pick the latest by date field, falling back if missing
-    def ts(item):
-        v = item.get(DATE_FIELD)
+    # Pick the latest by date field, falling back if missing. Single inline pass:
+    # int epochs (the common case) skip the conversion call; ties keep the first item
+    date_field, date_fallback = DATE_FIELD, DATE_FALLBACK
+    latest, latest_ts = None, None
+    for item in data:
+        v = item.get(date_field)
         if v is None:
-            v = item.get(DATE_FALLBACK)
-        try:
-            return int(v)
-        except Exception:
-            # Try parse string timestamp (ISO8601 or date)
-            try:
-                from datetime import datetime
-                return int(datetime.fromisoformat(str(v)).timestamp())
-            except Exception:
-                return -1
-
-    latest = max(data, key=ts)
+            v = item.get(date_fallback)
+        t = v if type(v) is int else to_epoch(v)
+        if latest_ts is None or t > latest_ts:
+            latest, latest_ts = item, t
     title = latest.get("title", "")
     company = latest.get("company_name", latest.get("company", ""))
     url = latest.get("url", latest.get("application_link", ""))
@@ -10,11 +10,14 @@ Configuration via environment variables:
 - DATE_FIELD [default: "date_posted"], DATE_FALLBACK [default: "date_updated"]
 - COUNT [default: 10]
 """
-import os, json, base64, requests
+import os, json, heapq
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from urllib.parse import urlparse
-from github_helper import fetch_file_content, fetch_file_json, debug_log, gh_get, GH
+from functools import lru_cache
+from github_helper import fetch_file_json, gh_get, GH
+from repo_utils import list_tree_paths
 from format_utils import format_location, format_job_line
+from telegram_utils import send_message, batch_send_message
 
 # Multi-repo support with fallback to single repo
 TARGET_REPOS_STR = os.getenv("TARGET_REPOS")
@@ -27,11 +30,21 @@ else:
 LISTINGS_PATH = os.getenv("LISTINGS_PATH", "listings.json")
 DATE_FIELD = os.getenv("DATE_FIELD", "date_posted")
 DATE_FALLBACK = os.getenv("DATE_FALLBACK", "date_updated")
+MAX_TELEGRAM_MESSAGE_CHARS = 3900  # Leave headroom under Telegram's 4096-char limit
 COUNT = max(1, int(os.getenv("COUNT", "10") or 10))
 MESSAGE_PREFIX = os.getenv("MESSAGE_PREFIX", "")  # Context prefix for messages
 
 def detect_listings_path(repo, branch="main"):
     """Auto-detect listings.json path within repo"""
+    # One Git Trees call lists every path without downloading any file content
+    tree_paths = list_tree_paths(repo, branch)
+    if tree_paths is not None:
+        for path in ("listings.json", ".github/listings.json"):
+            if path in tree_paths:
+                return path
+        return "listings.json"
+    
+    # Tree unavailable or truncated: probe the candidate paths individually
     try:
         # Try listings.json in root first
         gh_get(f"{GH}/repos/{repo}/contents/listings.json", ref=branch)
@@ -45,20 +58,28 @@ def detect_listings_path(repo, branch="main"):
             # Default fallback
             return "listings.json"
 
-def get_file(repo, path: str, ref: str | None = None) -> str:
-    """Fetch a file's content from a repo at optional ref using robust helper"""
-    return fetch_file_content(repo, path, ref)
+def fetch_repo_listings(repo):
+    """Detect the listings path and fetch/parse one repo's listings (runs in a worker thread)"""
+    # Auto-detect listings path for this repo
+    listings_path = LISTINGS_PATH if LISTINGS_PATH != "listings.json" else detect_listings_path(repo)
+    
+    print(f"Fetching from {repo}:{listings_path}")
+    # Parse the raw bytes directly (orjson when installed) instead of decode + json.loads
+    return fetch_file_json(repo, listings_path)
+
+@lru_cache(maxsize=65536)
+def _normalize_url_cached(url):
+    """Cached worker for normalize_url; expects a non-empty string"""
+    # Keep scheme, netloc (host), and path; drop fragment and query with plain
+    # string splits instead of urlparse (keys are only compared within this run)
+    return url.partition("#")[0].partition("?")[0].rstrip('/')
 
 def normalize_url(url):
     """Normalize URL to scheme+host+path for deduplication"""
     if not url:
         return None
-    try:
-        parsed = urlparse(url)
-        # Keep scheme, netloc (host), and path; drop query and fragment
-        return f"{parsed.scheme}://{parsed.netloc}{parsed.path}".rstrip('/')
-    except Exception:
-        return url
+    # str() keeps non-str/unhashable values from raising in the cache
+    return _normalize_url_cached(str(url))
 
 def get_dedup_key(item):
     """Get deduplication key: normalized_url -> id -> (company.lower(), title.lower())"""
@@ -156,20 +177,29 @@ def send_telegram(text: str) -> bool:
     if not tok or not chat:
         print("Missing TELEGRAM_BOT_TOKEN or TELEGRAM_CHAT_ID")
         return False
-    r = requests.post(
-        f"https://api.telegram.org/bot{tok}/sendMessage",
-        json={
-            "chat_id": chat,
-            "text": text,
-            "disable_web_page_preview": True,
-            "parse_mode": "HTML",
-        },
-        timeout=30,
-    )
-    print("Telegram status:", r.status_code)
-    if not r.ok:
-        print(r.text)
-    return r.ok
+    ok, status, body = send_message(tok, chat, text, parse_mode="HTML")
+    print("Telegram status:", status)
+    if not ok:
+        print(body)
+    return ok
+
+def send_telegram_lines(header: str, lines: list) -> bool:
+    """Send header + blank-line-separated entries, batching when over Telegram's limit"""
+    text = "\n\n".join([header, *lines])
+    if len(text) <= MAX_TELEGRAM_MESSAGE_CHARS:
+        return send_telegram(text)
+    
+    tok = os.getenv("TELEGRAM_BOT_TOKEN"); chat = os.getenv("TELEGRAM_CHAT_ID")
+    if not tok or not chat:
+        print("Missing TELEGRAM_BOT_TOKEN or TELEGRAM_CHAT_ID")
+        return False
+    # Batches join lines with a single newline; the trailing "\n" keeps the blank
+    # line between entries (and is counted toward each batch's length)
+    spaced = [f"{line}\n" for line in lines[:-1]] + lines[-1:]
+    ok, results = batch_send_message(tok, chat, header, spaced, max_chars=MAX_TELEGRAM_MESSAGE_CHARS, parse_mode="HTML")
+    if not ok:
+        print("Some batches failed:", [r for r in results if r[1] < 200 or r[1] >= 300])
+    return ok
 
 def to_epoch(v) -> int:
     try:
@@ -188,15 +218,15 @@ def main() -> int:
     all_items = []
     seen_keys = set()
     
+    # Fetch all repositories concurrently (network-bound); results are processed
+    # below in TARGET_REPOS order so cross-repo dedup priority is unchanged
+    with ThreadPoolExecutor(max_workers=max(1, min(16, len(TARGET_REPOS)))) as pool:
+        futures = [pool.submit(fetch_repo_listings, repo) for repo in TARGET_REPOS]
+    
     # Process each repository
-    for repo in TARGET_REPOS:
+    for repo, future in zip(TARGET_REPOS, futures):
         try:
-            # Auto-detect listings path for this repo
-            listings_path = LISTINGS_PATH if LISTINGS_PATH != "listings.json" else detect_listings_path(repo)
-            
-            print(f"Fetching from {repo}:{listings_path}")
-            txt = get_file(repo, listings_path)
-            data = json.loads(txt)
+            data = future.result()
             
             if not isinstance(data, list):
                 print(f"Unexpected JSON structure in {repo}")
@@ -213,12 +243,17 @@ def main() -> int:
                         print(f"Filtered out {x.get('company_name', 'Unknown')} - {x.get('title', 'Unknown')} (category: {debug_category})")
                     continue
                     
-                if sort_key(x) > 0:  # Valid timestamp
-                    dedup_key = get_dedup_key(x)
+                ts = sort_key(x)
+                if ts > 0:  # Valid timestamp
+                    # URL key inline for the common case; full helper only as fallback
+                    norm_url = normalize_url(x.get("url"))
+                    dedup_key = ("url", norm_url) if norm_url else get_dedup_key(x)
                     if dedup_key and dedup_key not in seen_keys:
                         seen_keys.add(dedup_key)
-                        # Add repo info for source tracking
+                        # Add repo info for source tracking; keep the parsed timestamp
+                        # so sorting and rendering don't re-parse the date
                         x["_source_repo"] = repo
+                        x["_ts"] = ts
                         repo_items.append(x)
             
             all_items.extend(repo_items)
@@ -232,9 +267,9 @@ def main() -> int:
         send_telegram("No recent listings found.")
         return 0
 
-    # Sort by company name alphabetically, then by timestamp descending
-    sorted_items = sorted(all_items, key=lambda x: (x.get("company_name", x.get("company", "")).lower(), -sort_key(x)))
-    top = sorted_items[:COUNT]
+    # Sort by company name alphabetically, then by timestamp descending. Only the
+    # first COUNT are needed; nsmallest equals sorted(...)[:COUNT] in O(n log COUNT)
+    top = heapq.nsmallest(COUNT, all_items, key=lambda x: (x.get("company_name", x.get("company", "")).lower(), -x["_ts"]))
 
     lines = []
     for x in top:
@@ -248,7 +283,7 @@ def main() -> int:
         location = format_location(locations, mode="dm")
         
         # Include a relative date if available
-        ts = sort_key(x)
+        ts = x["_ts"]
         when = datetime.utcfromtimestamp(ts).strftime("%Y-%m-%d") if ts > 0 else ""
         
         # Format the line using the helper, then add date info
@@ -263,7 +298,7 @@ def main() -> int:
     # Add context prefix if provided
     prefix = f"{MESSAGE_PREFIX}: " if MESSAGE_PREFIX else ""
     header = f"{prefix}Most recent listings: {len(top)}"
-    send_telegram("\n\n".join([header, *lines]))
+    send_telegram_lines(header, lines)
     return 0
 
 if __name__ == "__main__":
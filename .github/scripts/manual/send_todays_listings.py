@@ -15,11 +15,14 @@ Assumptions and behavior:
 - The script sends at most 15 detailed entries to avoid overly long messages.
 - Deduplicates across repos using URL-first strategy.
 """
-import os, json, base64, requests
+import os, json, heapq
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from urllib.parse import urlparse
-from github_helper import fetch_file_content, fetch_file_json, debug_log, gh_get, GH
+from functools import lru_cache
+from github_helper import fetch_file_json, gh_get, GH
+from repo_utils import list_tree_paths
 from format_utils import format_location, format_job_line
+from telegram_utils import send_message, batch_send_message
 
 # Multi-repo support with fallback to single repo
 TARGET_REPOS_STR = os.getenv("TARGET_REPOS")
@@ -34,9 +37,19 @@ MESSAGE_PREFIX = os.getenv("MESSAGE_PREFIX", "")  # Context prefix for messages
 LISTINGS_PATH = os.getenv("LISTINGS_PATH", "listings.json")
 DATE_FIELD = os.getenv("DATE_FIELD", "date_posted")
 DATE_FALLBACK = os.getenv("DATE_FALLBACK", "date_updated")
+MAX_TELEGRAM_MESSAGE_CHARS = 3900  # Leave headroom under Telegram's 4096-char limit
 
 def detect_listings_path(repo, branch="main"):
     """Auto-detect listings.json path within repo"""
+    # One Git Trees call lists every path without downloading any file content
+    tree_paths = list_tree_paths(repo, branch)
+    if tree_paths is not None:
+        for path in ("listings.json", ".github/listings.json"):
+            if path in tree_paths:
+                return path
+        return "listings.json"
+    
+    # Tree unavailable or truncated: probe the candidate paths individually
     try:
         # Try listings.json in root first
         gh_get(f"{GH}/repos/{repo}/contents/listings.json", ref=branch)
@@ -50,20 +63,28 @@ def detect_listings_path(repo, branch="main"):
             # Default fallback
             return "listings.json"
 
-def get_file(repo, path: str, ref: str | None = None) -> str:
-    """Fetch a file's content from a repo at optional ref using robust helper"""
-    return fetch_file_content(repo, path, ref)
+def fetch_repo_listings(repo):
+    """Detect the listings path and fetch/parse one repo's listings (runs in a worker thread)"""
+    # Auto-detect listings path for this repo
+    listings_path = LISTINGS_PATH if LISTINGS_PATH != "listings.json" else detect_listings_path(repo)
+    
+    print(f"Fetching from {repo}:{listings_path}")
+    # Parse the raw bytes directly (orjson when installed) instead of decode + json.loads
+    return fetch_file_json(repo, listings_path)
+
+@lru_cache(maxsize=65536)
+def _normalize_url_cached(url):
+    """Cached worker for normalize_url; expects a non-empty string"""
+    # Keep scheme, netloc (host), and path; drop fragment and query with plain
+    # string splits instead of urlparse (keys are only compared within this run)
+    return url.partition("#")[0].partition("?")[0].rstrip('/')
 
 def normalize_url(url):
     """Normalize URL to scheme+host+path for deduplication"""
     if not url:
         return None
-    try:
-        parsed = urlparse(url)
-        # Keep scheme, netloc (host), and path; drop query and fragment
-        return f"{parsed.scheme}://{parsed.netloc}{parsed.path}".rstrip('/')
-    except Exception:
-        return url
+    # str() keeps non-str/unhashable values from raising in the cache
+    return _normalize_url_cached(str(url))
 
 def get_dedup_key(item):
     """Get deduplication key: normalized_url -> id -> (company.lower(), title.lower())"""
@@ -94,11 +115,6 @@ def get_unified_season(item):
     else:
         return ""
 
-def should_include_listing(item):
-    """Filter out listings with missing/invalid URLs for better quality"""
-    url = item.get("url", "").strip()
-    return bool(url)  # Skip entries with falsy URLs
-
 def send_telegram(text: str) -> bool:
     """Send a Telegram message to the configured chat.
 
@@ -108,21 +124,30 @@ def send_telegram(text: str) -> bool:
     if not tok or not chat:
         print("Missing TELEGRAM_BOT_TOKEN or TELEGRAM_CHAT_ID")
         return False
-    r = requests.post(
-        f"https://api.telegram.org/bot{tok}/sendMessage",
-        json={
-            "chat_id": chat,
-            "text": text,
-            "disable_web_page_preview": True,
-            "parse_mode": "HTML",
-        },
-        timeout=30,
-    )
-    print("Telegram status:", r.status_code)
-    if not r.ok:
+    ok, status, body = send_message(tok, chat, text, parse_mode="HTML")
+    print("Telegram status:", status)
+    if not ok:
         # Print the response text only on error for diagnostics
-        print(r.text)
-    return r.ok
+        print(body)
+    return ok
+
+def send_telegram_lines(header: str, lines: list) -> bool:
+    """Send header + blank-line-separated entries, batching when over Telegram's limit"""
+    text = "\n\n".join([header, *lines])
+    if len(text) <= MAX_TELEGRAM_MESSAGE_CHARS:
+        return send_telegram(text)
+    
+    tok = os.getenv("TELEGRAM_BOT_TOKEN"); chat = os.getenv("TELEGRAM_CHAT_ID")
+    if not tok or not chat:
+        print("Missing TELEGRAM_BOT_TOKEN or TELEGRAM_CHAT_ID")
+        return False
+    # Batches join lines with a single newline; the trailing "\n" keeps the blank
+    # line between entries (and is counted toward each batch's length)
+    spaced = [f"{line}\n" for line in lines[:-1]] + lines[-1:]
+    ok, results = batch_send_message(tok, chat, header, spaced, max_chars=MAX_TELEGRAM_MESSAGE_CHARS, parse_mode="HTML")
+    if not ok:
+        print("Some batches failed:", [r for r in results if r[1] < 200 or r[1] >= 300])
+    return ok
 
 def to_epoch(v) -> int:
     """Convert value to epoch seconds. Supports int-like and ISO-8601 strings.
@@ -140,42 +165,49 @@ def to_epoch(v) -> int:
 def main() -> int:
     """Entrypoint: fetch listings from multiple repos, filter those posted today (UTC), and notify."""
     today = datetime.now(timezone.utc).date()
+    # Today's UTC day as an epoch range, so each row needs only integer compares
+    today_start = int(datetime(today.year, today.month, today.day, tzinfo=timezone.utc).timestamp())
+    today_end = today_start + 86400
     all_todays = []
     seen_keys = set()
     
+    # Fetch all repositories concurrently (network-bound); results are processed
+    # below in TARGET_REPOS order so cross-repo dedup priority is unchanged
+    with ThreadPoolExecutor(max_workers=max(1, min(16, len(TARGET_REPOS)))) as pool:
+        futures = [pool.submit(fetch_repo_listings, repo) for repo in TARGET_REPOS]
+    
     # Process each repository
-    for repo in TARGET_REPOS:
+    for repo, future in zip(TARGET_REPOS, futures):
         try:
-            # Auto-detect listings path for this repo
-            listings_path = LISTINGS_PATH if LISTINGS_PATH != "listings.json" else detect_listings_path(repo)
-            
-            print(f"Fetching from {repo}:{listings_path}")
-            txt = get_file(repo, listings_path)
-            data = json.loads(txt)
+            data = future.result()
             
             if not isinstance(data, list):
                 print(f"Unexpected JSON structure in {repo}")
                 continue
             
             repo_todays = []
+            date_field, date_fallback = DATE_FIELD, DATE_FALLBACK
             for x in data:
-                # Skip items with falsy URLs for better quality
-                if not should_include_listing(x):
+                # Fused per-row checks, cheapest first: today's epoch range (int epochs
+                # skip to_epoch), then URL presence, then the dedup key
+                ts = x.get(date_field, x.get(date_fallback))
+                epoch = ts if type(ts) is int else to_epoch(ts)
+                if not today_start <= epoch < today_end:
                     continue
-                    
-                ts = x.get(DATE_FIELD, x.get(DATE_FALLBACK))
-                epoch = to_epoch(ts)
-                if epoch <= 0:
+                
+                # Skip items with falsy URLs for better quality
+                url = x.get("url")
+                if not url or not url.strip():
                     continue
-                    
-                d = datetime.fromtimestamp(epoch, tz=timezone.utc).date()
-                if d == today:
-                    dedup_key = get_dedup_key(x)
-                    if dedup_key and dedup_key not in seen_keys:
-                        seen_keys.add(dedup_key)
-                        # Add repo info for source tracking
-                        x["_source_repo"] = repo
-                        repo_todays.append(x)
+                
+                # URL key inline for the common case; full helper only as fallback
+                norm_url = normalize_url(url)
+                dedup_key = ("url", norm_url) if norm_url else get_dedup_key(x)
+                if dedup_key and dedup_key not in seen_keys:
+                    seen_keys.add(dedup_key)
+                    # Add repo info for source tracking
+                    x["_source_repo"] = repo
+                    repo_todays.append(x)
             
             all_todays.extend(repo_todays)
             print(f"Found {len(repo_todays)} unique listings from {repo} for today")
@@ -189,11 +221,12 @@ def main() -> int:
         send_telegram("No new listings posted today.")
         return 0
 
-    # Sort by company name alphabetically
-    all_todays.sort(key=lambda x: x.get("company_name", x.get("company", "")).lower())
+    # Sort by company name alphabetically; only the first 15 are shown, so select
+    # them with nsmallest (same result as sort + slice) instead of sorting everything
+    top = heapq.nsmallest(15, all_todays, key=lambda x: x.get("company_name", x.get("company", "")).lower())
 
     lines = []
-    for x in all_todays[:15]:  # Limit to 15 entries
+    for x in top:  # Limit to 15 entries
         title = x.get("title", "")
         company = x.get("company_name", x.get("company", ""))
         url = x.get("url", x.get("application_link", ""))
@@ -209,7 +242,7 @@ def main() -> int:
     # Add context prefix if provided
     prefix = f"{MESSAGE_PREFIX}: " if MESSAGE_PREFIX else ""
     header = f"{prefix}New listings today: {len(all_todays)}"
-    send_telegram("\n\n".join([header, *lines]))
+    send_telegram_lines(header, lines)
     return 0
 
 if __name__ == "__main__":
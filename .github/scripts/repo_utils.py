@@ -4,19 +4,137 @@ GitHub repository utilities for the job tracker.
 Handles commit fetching, file operations, and repository metadata.
 """
 import os
+import json
+import pathlib
+import threading
+import time
 from github_helper import fetch_file_content, debug_log, gh_get, GH
 
+# Persistent cache of slow-changing repo metadata (default branch, listings path).
+# Stored under STATE_DIR so the workflow state cache carries it between runs.
+REPO_META_PATH = pathlib.Path(os.getenv("STATE_DIR", ".state")) / "repo_meta.json"
+REPO_META_TTL_SECONDS = int(os.getenv("REPO_META_TTL_HOURS", "24")) * 3600
+REFRESH_META = os.getenv("REFRESH_META", "false").lower() == "true"
 
-def get_default_branch(repo):
-    """Get default branch for a repository"""
+_repo_meta = None
+_repo_meta_lock = threading.Lock()
+
+
+def load_repo_meta(path=REPO_META_PATH):
+    """
+    Load repo metadata cache from JSON file.
+    
+    Returns:
+        dict[str, dict]: Mapping of cache key -> {"value": str, "ts": epoch}
+    """
+    try:
+        meta_path = pathlib.Path(path)
+        if meta_path.exists():
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+    except Exception as e:
+        debug_log(f"[META] Failed to load repo metadata cache from {path}: {e}")
+    return {}
+
+
+def save_repo_meta(meta, path=REPO_META_PATH):
+    """Save repo metadata cache to JSON file; failures are non-fatal"""
+    try:
+        meta_path = pathlib.Path(path)
+        meta_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=2)
+    except Exception as e:
+        debug_log(f"[META] Failed to save repo metadata cache to {path}: {e}")
+
+
+def _get_cached_meta(key, refresh=False):
+    """Return a cached metadata value if present and fresh, else None"""
+    global _repo_meta
+    if REFRESH_META or refresh:
+        return None
+    with _repo_meta_lock:
+        if _repo_meta is None:
+            _repo_meta = load_repo_meta()
+        entry = _repo_meta.get(key)
+    if isinstance(entry, dict) and time.time() - entry.get("ts", 0) < REPO_META_TTL_SECONDS:
+        return entry.get("value")
+    return None
+
+
+def _set_cached_meta(key, value):
+    """Store a metadata value and persist the cache"""
+    global _repo_meta
+    with _repo_meta_lock:
+        if _repo_meta is None:
+            _repo_meta = load_repo_meta()
+        _repo_meta[key] = {"value": value, "ts": int(time.time())}
+        save_repo_meta(_repo_meta)
+
+
+def invalidate_repo_meta(repo):
+    """
+    Drop cached branch/path entries for a repo so they are re-probed from GitHub.
+    
+    Returns:
+        bool: True if any cached entries were dropped
+    """
+    global _repo_meta
+    with _repo_meta_lock:
+        if _repo_meta is None:
+            _repo_meta = load_repo_meta()
+        stale = [k for k in _repo_meta if k == f"branch:{repo}" or k.startswith(f"path:{repo}@")]
+        if not stale:
+            return False
+        for key in stale:
+            del _repo_meta[key]
+        save_repo_meta(_repo_meta)
+    debug_log(f"[META] Invalidated cached metadata for {repo}")
+    return True
+
+
+def get_default_branch(repo, refresh=False):
+    """Get default branch for a repository (cached for REPO_META_TTL_HOURS unless refresh)"""
+    cache_key = f"branch:{repo}"
+    branch = _get_cached_meta(cache_key, refresh)
+    if branch:
+        debug_log(f"[BRANCH] {repo} default branch: {branch} (cached)")
+        return branch
+    
     repo_info = gh_get(f"{GH}/repos/{repo}")
     branch = repo_info["default_branch"]
     debug_log(f"[BRANCH] {repo} default branch: {branch}")
+    _set_cached_meta(cache_key, branch)
     return branch
 
 
-def detect_listings_path(repo, branch, fallback_path=".github/scripts/listings.json"):
-    """Auto-detect listings.json path within repo"""
+def list_tree_paths(repo, ref):
+    """
+    List all file paths in a repo at ref using a single recursive Git Trees call.
+    
+    Returns:
+        set[str] | None: Blob paths, or None if the tree was truncated or the call failed
+    """
+    try:
+        tree = gh_get(f"{GH}/repos/{repo}/git/trees/{ref}", recursive=1)
+    except Exception as e:
+        debug_log(f"[PATH] {repo} tree listing failed for {ref}: {e}")
+        return None
+    if tree.get("truncated"):
+        debug_log(f"[PATH] {repo} tree listing truncated for {ref}; probing paths individually")
+        return None
+    return {entry["path"] for entry in tree.get("tree", []) if entry.get("type") == "blob"}
+
+
+def detect_listings_path(repo, branch, fallback_path=".github/scripts/listings.json", refresh=False):
+    """Auto-detect listings.json path within repo (cached for REPO_META_TTL_HOURS unless refresh)"""
+    cache_key = f"path:{repo}@{branch}:{fallback_path}"
+    cached_path = _get_cached_meta(cache_key, refresh)
+    if cached_path:
+        debug_log(f"[PATH] {repo} found listings at: {cached_path} (cached)")
+        return cached_path
+    
     # First check the configured/fallback path if it's not one of the defaults
     paths_to_try = [".github/scripts/listings.json", "listings.json"]
     
@@ -28,10 +146,22 @@ def detect_listings_path(repo, branch, fallback_path=".github/scripts/listings.j
         paths_to_try.remove(fallback_path)
         paths_to_try.insert(0, fallback_path)
     
+    # One Git Trees call lists every path, replacing up to 3 contents probes
+    tree_paths = list_tree_paths(repo, branch)
+    if tree_paths is not None:
+        for path in paths_to_try:
+            if path in tree_paths:
+                debug_log(f"[PATH] {repo} found listings at: {path}")
+                _set_cached_meta(cache_key, path)
+                return path
+        debug_log(f"[PATH] {repo} using fallback path: {fallback_path}")
+        return fallback_path  # fallback
+    
     for path in paths_to_try:
         try:
             gh_get(f"{GH}/repos/{repo}/contents/{path}", ref=branch)
             debug_log(f"[PATH] {repo} found listings at: {path}")
+            _set_cached_meta(cache_key, path)
             return path
         except Exception as e:
             if "404" not in str(e):
@@ -67,5 +197,11 @@ def get_file_at(repo, ref, path):
 
 
 def watched(path, watch_paths):
-    """Check if a file path should be watched based on configured watch paths"""
-    return any(path == p or path.startswith(p) for p in watch_paths)
\ No newline at end of file
+    """Check if a file path should be watched based on configured watch paths.
+    
+    Pass watch_paths as a tuple to test every prefix in a single C-level
+    str.startswith call (startswith also covers exact matches).
+    """
+    if not isinstance(watch_paths, tuple):
+        watch_paths = tuple(watch_paths)
+    return path.startswith(watch_paths)
\ No newline at end of file
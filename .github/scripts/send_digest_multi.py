@@ -5,6 +5,7 @@ filter by time window, and send consolidated digest to Telegram with batching.
 
 Environment variables:
 - TARGET_REPOS: JSON array of repo names (e.g., '["owner1/repo1", "owner2/repo2"]')
+- TARGET_REPO: Single repo name, used when TARGET_REPOS is not set
 - LISTINGS_PATH: Hint for listings file path (default: ".github/scripts/listings.json")
 - DATE_FIELD: Primary date field (default: "date_posted")
 - DATE_FALLBACK: Fallback date field (default: "date_updated")
@@ -15,21 +16,29 @@ Environment variables:
 """
 import os
 import json
+import heapq
 import pathlib
+import re
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from datetime import datetime, timezone, timedelta
 
 # Utility imports
 from github_helper import fetch_file_json, debug_log
 from state_utils import load_seen, save_seen, should_alert_item, get_cache_key, format_epoch_for_log, should_include_item
-from format_utils import format_location, log_location_resolution, format_job_line
+from format_utils import format_location, format_job_line
 from telegram_utils import batch_send_message
-from repo_utils import get_default_branch, detect_listings_path
-from dedup_utils import get_dedup_key, get_primary_url, get_unified_season
+from repo_utils import get_default_branch, detect_listings_path, invalidate_repo_meta
+from dedup_utils import claim_dedup_key, get_primary_url, get_unified_season
 from job_filtering import should_process_digest_item
 
 # Configuration
-TARGET_REPOS = json.loads(os.environ.get("TARGET_REPOS", '["vanshb03/Summer2026-Internships"]'))
+# A single TARGET_REPO (the old single-repo digest's setting) is treated as a one-repo list
+if not os.environ.get("TARGET_REPOS") and os.environ.get("TARGET_REPO"):
+    TARGET_REPOS = [os.environ["TARGET_REPO"]]
+else:
+    TARGET_REPOS = json.loads(os.environ.get("TARGET_REPOS", '["vanshb03/Summer2026-Internships"]'))
 LISTINGS_PATH = os.environ.get("LISTINGS_PATH", ".github/scripts/listings.json")
 DATE_FIELD = os.environ.get("DATE_FIELD", "date_posted")
 DATE_FALLBACK = os.environ.get("DATE_FALLBACK", "date_updated")
@@ -39,6 +48,7 @@ COUNT = int(os.environ.get("COUNT", "50") or "50")  # Handle empty string case
 # New: Category and degree filtering for multi-channel digests
 DIGEST_CATEGORIES = json.loads(os.environ.get("DIGEST_CATEGORIES", '["Software Engineering", "Data Science, AI & Machine Learning"]'))
 GRAD_FILTER_MODE = os.environ.get("FILTER_GRADUATE_DEGREES", "false").lower()  # 'true', 'false', or 'phd_only'
+DIGEST_CATEGORY_SET = frozenset(DIGEST_CATEGORIES)  # O(1) membership for per-item category checks
 
 debug_log(f"[CONFIG] DIGEST_CATEGORIES={DIGEST_CATEGORIES}")
 debug_log(f"[CONFIG] GRAD_FILTER_MODE={GRAD_FILTER_MODE}")
@@ -52,6 +62,9 @@ if FORCE_WINDOW_HOURS and FORCE_WINDOW_HOURS.replace('.', '').isdigit():
 # TTL configuration for seen cache
 SEEN_TTL_DAYS = int(os.environ.get("SEEN_TTL_DAYS", "14"))
 
+# Upper bound on concurrent per-repo fetches
+MAX_REPO_WORKERS = 8
+
 # Telegram message limits
 MAX_TELEGRAM_MESSAGE_CHARS = 3900  # Leave room for headers in batch messages
 
@@ -59,17 +72,28 @@ MAX_TELEGRAM_MESSAGE_CHARS = 3900  # Leave room for headers in batch messages
 EPOCH_MIN_TIMESTAMP = 631152000   # Jan 1, 1990 00:00:00 UTC
 EPOCH_MAX_TIMESTAMP = 2208988800  # Jan 1, 2040 00:00:00 UTC
 
+# Non-ISO date shape accepted by parse_dt (US month/day/year)
+_US_DATE_RE = re.compile(r"(\d{1,2})/(\d{1,2})/(\d{4}|\d{2})")
+
 # State directory (configurable for cache separation)
 STATE_DIR = pathlib.Path(os.environ.get("STATE_DIR", ".state"))
 STATE_DIR.mkdir(exist_ok=True, parents=True)
 
 
 def get_listings(repo, path, ref=None):
-    """Fetch and parse listings JSON from a repository using robust helper"""
+    """
+    Fetch and parse listings JSON from a repository using robust helper.
+    
+    Raises:
+        FileNotFoundError: If the path does not exist (other errors yield [])
+    """
     try:
         listings = fetch_file_json(repo, path, ref)
         debug_log(f"[LISTINGS] {repo}:{path} → {len(listings)} items")
         return listings
+    except FileNotFoundError as e:
+        debug_log(f"[LISTINGS] {repo}:{path} → not found: {e}")
+        raise
     except Exception as e:
         debug_log(f"[LISTINGS] {repo}:{path} → error: {e}")
         return []
@@ -77,26 +101,26 @@ def get_listings(repo, path, ref=None):
 
 def should_include_listing(item):
     """Filter items using new digest-specific filtering with category and degree level support"""
+    # Digest-specific requirements to prevent blank formatting, checked first since
+    # they are cheap: require both title and company_name for proper digest display
+    title = (item.get("title") or "").strip()
+    company = (item.get("company_name") or "").strip()
+    if not (title and company):
+        return False
+    
     # Use the new unified filtering function
     should_process, reason = should_process_digest_item(
         item,
-        DIGEST_CATEGORIES,
+        DIGEST_CATEGORY_SET,
         GRAD_FILTER_MODE
     )
     
     if not should_process:
         # Debug log for filtered items
-        company = item.get("company_name", "Unknown")
-        title = (item.get("title") or "")[:50]
-        debug_log(f"[FILTER] Excluded: {company} - {title}... | Reason: {reason}")
+        debug_log(f"[FILTER] Excluded: {company} - {title[:50]}... | Reason: {reason}")
         return False
     
-    # Additional digest-specific requirements to prevent blank formatting
-    # Require both title and company_name for proper digest display
-    title = (item.get("title") or "").strip()
-    company = (item.get("company_name") or "").strip()
-    
-    return bool(title) and bool(company)
+    return True
 
 
 def parse_dt(s):
@@ -104,55 +128,128 @@ def parse_dt(s):
     if not s:
         return None
     
+    # Numeric epochs (the common case for listings) skip string conversion entirely
+    if type(s) in (int, float) and EPOCH_MIN_TIMESTAMP <= s <= EPOCH_MAX_TIMESTAMP:
+        return datetime.fromtimestamp(s, tz=timezone.utc)
+    
+    # Convert to string for string-based parsing; many listings share a timestamp,
+    # so the parse itself is memoized on the normalized string
+    return _parse_dt_str(str(s).strip())
+
+
+@lru_cache(maxsize=4096)
+def _parse_dt_str(s):
+    """Parse a stripped date string (see parse_dt); results are immutable datetimes"""
     # First try to handle Unix epoch timestamps (int, float, or string digits)
-    try:
-        # Convert to string first, then try to parse as numeric
-        s_str = str(s).strip()
-        
-        # Check if it's all digits (possibly with decimal point for float)
-        if s_str.replace('.', '').isdigit():
-            timestamp = float(s_str)
+    if s.replace('.', '').isdigit():
+        try:
+            timestamp = float(s)
             # Reasonable epoch range check to prevent invalid date parsing
             if EPOCH_MIN_TIMESTAMP <= timestamp <= EPOCH_MAX_TIMESTAMP:
                 return datetime.fromtimestamp(timestamp, tz=timezone.utc)
-    except (ValueError, OSError, OverflowError):
-        pass
-    
-    # Convert to string for string-based parsing
-    s = str(s).strip()
+        except (ValueError, OSError, OverflowError):
+            pass
     
-    # Try most common format first: 2024-12-19 (ISO date only)
-    try:
-        dt = datetime.fromisoformat(s)
-        # If no timezone info, assume UTC; otherwise convert to UTC
-        if dt.tzinfo is None:
-            return dt.replace(tzinfo=timezone.utc)
-        else:
-            return dt.astimezone(timezone.utc)
-    except:
-        pass
-    
-    # Try with more lenient parsing
-    formats = [
-        "%Y-%m-%dT%H:%M:%SZ",           # ISO 8601 with Z
-        "%Y-%m-%dT%H:%M:%S",            # ISO 8601 without timezone
-        "%Y-%m-%d %H:%M:%S",            # Space-separated datetime
-        "%m/%d/%Y",                     # US date format
-        "%m/%d/%y",                     # US date format (2-digit year)
-    ]
-    
-    for fmt in formats:
+    # Dispatch on shape instead of trying every parser and catching failures.
+    # ISO-8601 (date, datetime, with/without Z or offset) starts with a 4-digit year.
+    if s[:4].isdigit():
+        try:
+            dt = datetime.fromisoformat(s)
+            # If no timezone info, assume UTC; otherwise convert to UTC
+            if dt.tzinfo is None:
+                return dt.replace(tzinfo=timezone.utc)
+            else:
+                return dt.astimezone(timezone.utc)
+        except ValueError:
+            pass
+    
+    # US date format: MM/DD/YYYY or MM/DD/YY (assumed UTC)
+    match = _US_DATE_RE.fullmatch(s)
+    if match:
+        month, day, year = (int(g) for g in match.groups())
+        if len(match.group(3)) == 2:
+            # Same pivot as strptime's %y: 69-99 -> 1900s, 00-68 -> 2000s
+            year += 1900 if year >= 69 else 2000
         try:
-            dt = datetime.strptime(s, fmt)
-            # These formats don't include timezone info, so assume UTC
-            return dt.replace(tzinfo=timezone.utc)
-        except:
-            continue
+            return datetime(year, month, day, tzinfo=timezone.utc)
+        except ValueError:
+            pass
     
     debug_log(f"[PARSE] Failed to parse date: '{s}'")
     return None
 
 
+def fetch_repo_items(repo, cutoff_epoch):
+    """
+    Fetch one repo's listings and return those passing filters within the time window.
+    
+    Returns:
+        list[tuple[float, str, dict]]: (timestamp, repo, item) for each kept listing
+    """
+    debug_log(f"[REPO] Processing {repo}")
+    
+    try:
+        # Get repository info
+        branch = get_default_branch(repo)
+        listings_path = detect_listings_path(repo, branch, LISTINGS_PATH)  # Pass LISTINGS_PATH as fallback
+        
+        # Fetch listings
+        try:
+            listings = get_listings(repo, listings_path)
+        except FileNotFoundError:
+            # Cached branch/path may be stale (renamed branch, moved file): drop them,
+            # re-probe without the cache and retry once. Nothing cached means nothing to retry.
+            if not invalidate_repo_meta(repo):
+                raise
+            branch = get_default_branch(repo, refresh=True)
+            listings_path = detect_listings_path(repo, branch, LISTINGS_PATH, refresh=True)
+            listings = get_listings(repo, listings_path)
+        if not listings:
+            debug_log(f"[REPO] {repo} → No listings found")
+            return []
+        
+        debug_log(f"[REPO] {repo} → {len(listings)} total items")
+        
+        # Filter items. Globals read on every row are bound to locals once, since
+        # this loop runs over every listing in the file.
+        repo_items = []
+        date_field, date_fallback = DATE_FIELD, DATE_FALLBACK
+        epoch_min, epoch_max = EPOCH_MIN_TIMESTAMP, EPOCH_MAX_TIMESTAMP
+        for item in listings:
+            # Time window filter first: a cached parse plus one float compare rejects
+            # the bulk of a listings file before the costlier category/degree checks
+            dt_val = item.get(date_field) or item.get(date_fallback)
+            if type(dt_val) is str and dt_val.isdigit():
+                # Epoch digit strings get the same int treatment as epoch ints
+                dt_val = int(dt_val)
+            if type(dt_val) is int and epoch_min <= dt_val <= epoch_max:
+                # Integer epochs compare directly; no datetime is built for them
+                timestamp = dt_val
+            else:
+                dt = parse_dt(dt_val)
+                if not dt:
+                    continue
+                timestamp = dt.timestamp()
+            if timestamp < cutoff_epoch:
+                continue
+            
+            # Apply unified filtering: quality checks + category + degree level
+            # Note: should_include_listing() already calls should_process_digest_item()
+            # which performs all filtering (quality, category, degree level)
+            if not should_include_listing(item):
+                continue
+            
+            # Track repo/timestamp alongside the item instead of copying the dict
+            repo_items.append((timestamp, repo, item))
+        
+        debug_log(f"[REPO] {repo} → {len(repo_items)} items after filtering")
+        return repo_items
+        
+    except Exception as e:
+        debug_log(f"[REPO] {repo} → Error: {e}")
+        return []
+
+
 def send_telegram_batched(header, lines):
     """Send digest with batching for long messages"""
     debug_log(f"[TELEGRAM] Preparing to send digest: {header}")
@@ -198,7 +295,7 @@ def main():
     
     # Load seen cache for TTL-based duplicate prevention
     seen_cache_path = STATE_DIR / "seen.json"
-    seen = load_seen(str(seen_cache_path))
+    seen = load_seen(str(seen_cache_path), SEEN_TTL_DAYS)
     ttl_seconds = SEEN_TTL_DAYS * 24 * 3600
     now_epoch = int(time.time())
     
@@ -210,79 +307,42 @@ def main():
     
     debug_log(f"[WINDOW] Time cutoff: {cutoff_time.isoformat()} ({cutoff_epoch})")
     
-    all_items = []
-    
-    # Process each repository
-    for repo in TARGET_REPOS:
-        debug_log(f"[REPO] Processing {repo}")
-        
-        try:
-            # Get repository info
-            branch = get_default_branch(repo)
-            listings_path = detect_listings_path(repo, branch, LISTINGS_PATH)  # Pass LISTINGS_PATH as fallback
-            
-            # Fetch listings
-            listings = get_listings(repo, listings_path)
-            if not listings:
-                debug_log(f"[REPO] {repo} → No listings found")
-                continue
-            
-            debug_log(f"[REPO] {repo} → {len(listings)} total items")
-            
-            # Filter items
-            repo_items = []
-            for item in listings:
-                # Apply unified filtering: quality checks + category + degree level
-                # Note: should_include_listing() already calls should_process_digest_item()
-                # which performs all filtering (quality, category, degree level)
-                if not should_include_listing(item):
+    # Process repositories concurrently; each is dominated by GitHub API latency.
+    # map() preserves TARGET_REPOS order, so cross-repo dedup priority is unchanged.
+    # Dedup, TTL filtering and the top-COUNT selection are fused into one streaming
+    # pass: a min-heap of (timestamp, -arrival) keeps only the COUNT newest items,
+    # with ties going to the earlier item exactly like a stable sort-then-slice.
+    total_count = dedup_count = ttl_count = 0
+    seen_urls, seen_ids, seen_company_titles = set(), set(), set()
+    top_heap = []
+    with ThreadPoolExecutor(max_workers=max(1, min(len(TARGET_REPOS), MAX_REPO_WORKERS))) as pool:
+        for repo_items in pool.map(lambda repo: fetch_repo_items(repo, cutoff_epoch), TARGET_REPOS):
+            total_count += len(repo_items)
+            for entry in repo_items:
+                # Deduplication by URL/ID (one set per key kind, no per-item key tuples)
+                if not claim_dedup_key(entry[2], seen_urls, seen_ids, seen_company_titles):
                     continue
+                dedup_count += 1
                 
-                # Time window filter
-                dt_val = item.get(DATE_FIELD) or item.get(DATE_FALLBACK)
-                dt = parse_dt(dt_val)
+                # TTL-based filtering (check if we've alerted for these recently)
+                # Note: don't update seen cache yet - only do that after successful send
+                should_alert, reason = should_alert_item(entry[2], seen, ttl_seconds, now_epoch)
+                if not should_alert:
+                    continue
+                ttl_count += 1
                 
-                if dt and dt.timestamp() >= cutoff_epoch:
-                    # Add repo info for tracking
-                    item_copy = item.copy()
-                    item_copy["_repo"] = repo
-                    item_copy["_timestamp"] = dt.timestamp()
-                    repo_items.append(item_copy)
-            
-            debug_log(f"[REPO] {repo} → {len(repo_items)} items after filtering")
-            all_items.extend(repo_items)
-            
-        except Exception as e:
-            debug_log(f"[REPO] {repo} → Error: {e}")
-            continue
-    
-    debug_log(f"[AGGREGATE] Total items from all repos: {len(all_items)}")
-    
-    # Deduplication by URL/ID
-    seen_keys = set()
-    deduplicated = []
+                heap_entry = (entry[0], -ttl_count, entry)
+                if len(top_heap) < COUNT:
+                    heapq.heappush(top_heap, heap_entry)
+                elif COUNT > 0:
+                    heapq.heappushpop(top_heap, heap_entry)
     
-    for item in all_items:
-        key = get_dedup_key(item)
-        if key and key not in seen_keys:
-            seen_keys.add(key)
-            deduplicated.append(item)
+    debug_log(f"[AGGREGATE] Total items from all repos: {total_count}")
+    debug_log(f"[DEDUP] After deduplication: {dedup_count} items")
+    debug_log(f"[TTL] After TTL filtering: {ttl_count} items")
     
-    debug_log(f"[DEDUP] After deduplication: {len(deduplicated)} items")
-    
-    # TTL-based filtering (check if we've alerted for these recently)
-    final_items = []
-    for item in deduplicated:
-        should_alert, reason = should_alert_item(item, seen, ttl_seconds, now_epoch)
-        if should_alert:
-            final_items.append(item)
-        # Note: don't update seen cache yet - only do that after successful send
-    
-    debug_log(f"[TTL] After TTL filtering: {len(final_items)} items")
-    
-    # Sort by timestamp (newest first) and limit
-    final_items.sort(key=lambda x: x.get("_timestamp", 0), reverse=True)
-    final_items = final_items[:COUNT]
+    # Newest first
+    final_items = [heap_entry[2] for heap_entry in sorted(top_heap, reverse=True)]
     
     debug_log(f"[LIMIT] After count limit: {len(final_items)} items")
     
@@ -292,26 +352,21 @@ def main():
         save_seen(seen, SEEN_TTL_DAYS, str(seen_cache_path))
         return True  # Success case - no items to send
     
-    # Format items for display
-    lines = []
-    for item in final_items:
-        title = item.get("title", "")
-        company = item.get("company_name", "")
-        url = get_primary_url(item)
-        season = get_unified_season(item)
-        
-        # Format location with digest mode for consistency
-        locations = item.get("locations", [])
-        location = format_location(locations, mode="digest")
-        
-        # Log location resolution for debugging (if multiple locations)
-        if locations and len(locations) > 1:
-            log_location_resolution(company, title, locations, location, "digest")
-        
-        # Extract source repo name for display (e.g., "SimplifyJobs" or "vanshb03")
-        source = item.get("_repo", "").split("/")[0] if item.get("_repo") else None
-        line = format_job_line(company, title, season, location, url, html=True, source=source)
-        lines.append(line)
+    # Format items for display in one pass. Locations use digest mode for
+    # consistency; log_location_resolution only reports DM-mode resolutions,
+    # so it is not called here. Source repo owner is shown, e.g. "vanshb03".
+    lines = [
+        format_job_line(
+            item.get("company_name", ""),
+            item.get("title", ""),
+            get_unified_season(item),
+            format_location(item.get("locations", []), mode="digest"),
+            get_primary_url(item),
+            html=True,
+            source=repo.split("/", 1)[0] if repo else None,
+        )
+        for _, repo, item in final_items
+    ]
     
     # Prepare header
     time_desc = f"last {WINDOW_HOURS}h" if WINDOW_HOURS < 24 else f"last {WINDOW_HOURS//24}d"
@@ -322,7 +377,7 @@ def main():
     
     if success:
         # Update seen cache only after successful send
-        for item in final_items:
+        for _, _, item in final_items:
             cache_key = get_cache_key(item)  # Use cache key, not dedup key
             if cache_key:
                 seen[cache_key] = now_epoch
@@ -5,11 +5,12 @@ Time-boxed seen cache with TTL for job tracker.
 Provides utilities to track when job listings were last alerted and allow
 re-opened roles (updated date_updated) to alert again immediately.
 """
-import json
 import pathlib
 import time
 from datetime import datetime, timezone
+from functools import lru_cache
 from urllib.parse import urlparse
+from json_utils import json_loads, json_dumps
 
 # Reopen detection grace period - prevents identical re-additions from bypassing TTL
 REOPEN_GRACE_PERIOD = 86400  # 1 day in seconds
@@ -22,6 +23,11 @@ def normalize_url(url):
     """Normalize URL to scheme+host+path for consistent caching"""
     if not url or not url.strip():
         return None
+    return _normalize_url_cached(url)
+
+@lru_cache(maxsize=65536)
+def _normalize_url_cached(url):
+    """Cached worker for normalize_url; keys are persisted, so urlparse semantics are kept"""
     try:
         parsed = urlparse(url.strip().lower())
         # Keep scheme, netloc (host), and path; drop query and fragment
@@ -81,20 +87,37 @@ def should_include_item(item):
     url = get_primary_url(item)
     return bool(url)
 
-def load_seen(path=".state/seen.json"):
+def seen_prune_cutoff(ttl_days, now=None):
+    """Epoch before which seen entries are dropped (TTL + 2 days buffer)"""
+    if now is None:
+        now = int(time.time())
+    return now - ((ttl_days + 2) * 24 * 3600)
+
+def load_seen(path=".state/seen.json", ttl_days=None):
     """
     Load seen cache from JSON file.
     
+    Args:
+        path: str, file path to load from
+        ttl_days: int, optional TTL in days; if given, expired entries are
+            dropped while loading so lookups run against a bounded dict
+    
     Returns:
         dict[str, int]: Mapping of cache_key -> last_alert_epoch
     """
     try:
         seen_path = pathlib.Path(path)
         if seen_path.exists():
-            with open(seen_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                # Ensure all values are integers (epoch seconds)
-                return {k: int(v) for k, v in data.items() if isinstance(v, (int, float, str))}
+            data = json_loads(seen_path.read_bytes())
+            # Ensure all values are integers (epoch seconds)
+            seen = {k: int(v) for k, v in data.items() if isinstance(v, (int, float, str))}
+            if ttl_days is not None:
+                prune_cutoff = seen_prune_cutoff(ttl_days)
+                loaded_count = len(seen)
+                seen = {k: v for k, v in seen.items() if v >= prune_cutoff}
+                if loaded_count > len(seen):
+                    print(f"Pruned {loaded_count - len(seen)} expired entries from seen cache on load (TTL={ttl_days}d)")
+            return seen
         return {}
     except Exception as e:
         print(f"Warning: Failed to load seen cache from {path}: {e}")
@@ -116,8 +139,7 @@ def save_seen(seen, ttl_days, path=".state/seen.json", max_entries=200000):
         seen_path.parent.mkdir(parents=True, exist_ok=True)
         
         # Prune entries older than TTL + 2 days buffer
-        now = int(time.time())
-        prune_cutoff = now - ((ttl_days + 2) * 24 * 3600)
+        prune_cutoff = seen_prune_cutoff(ttl_days)
         
         # Filter out old entries
         pruned_seen = {k: v for k, v in seen.items() if v >= prune_cutoff}
@@ -130,8 +152,7 @@ def save_seen(seen, ttl_days, path=".state/seen.json", max_entries=200000):
             print(f"Warning: Seen cache capped at {max_entries} entries (was {len(seen)})")
         
         # Save to file
-        with open(seen_path, 'w', encoding='utf-8') as f:
-            json.dump(pruned_seen, f, indent=2)
+        seen_path.write_bytes(json_dumps(pruned_seen))
         
         pruned_count = len(seen) - len(pruned_seen)
         if pruned_count > 0:
@@ -11,6 +11,9 @@ import time
 import requests
 from typing import List, Tuple, Optional
 
+# Shared session so consecutive batches reuse one keep-alive TLS connection
+_SESSION = requests.Session()
+
 def send_message(token: str, chat_id: str, text: str, parse_mode: Optional[str] = None) -> Tuple[bool, int, str]:
     """
     Send a single message to Telegram.
@@ -37,7 +40,7 @@ def send_message(token: str, chat_id: str, text: str, parse_mode: Optional[str]
         payload["parse_mode"] = parse_mode
     
     try:
-        response = requests.post(
+        response = _SESSION.post(
             f"https://api.telegram.org/bot{token}/sendMessage",
             json=payload,
             timeout=30
@@ -62,16 +62,19 @@ SEEN_TTL_DAYS = int(os.getenv("SEEN_TTL_DAYS", "14"))
 STATE_DIR = pathlib.Path(os.getenv("STATE_DIR", ".state"))
 STATE_DIR.mkdir(exist_ok=True, parents=True)
 
-def send_telegram(text):
+def send_telegram(header, lines):
     """Send message to Telegram with debug logging and automatic batching"""
-    debug_log(f"[TELEGRAM] Sending message: {len(text)} chars, preview: {text[:100]}...")
+    # Length of "\n".join([header] + lines), computed without building the string
+    text_len = len(header) + sum(len(line) + 1 for line in lines)
+    debug_log(f"[TELEGRAM] Sending message: {text_len} chars, preview: {header[:100]}...")
     tok = os.getenv("TELEGRAM_BOT_TOKEN"); chat = os.getenv("TELEGRAM_CHAT_ID")
     if not tok or not chat: 
         debug_log("[TELEGRAM] Missing credentials - BOT_TOKEN or CHAT_ID not set")
         return False
     
     # If message is short enough, send as single message
-    if len(text) <= 4000:
+    if text_len <= 4000:
+        text = "\n".join([header] + lines)
         success, status, body = send_message(tok, chat, text)
         debug_log(f"[TELEGRAM] STATUS={status} BODY={body[:200] if body else 'None'}")
         
@@ -80,17 +83,9 @@ def send_telegram(text):
         
         return success
     
-    # Message is too long - use batching
-    debug_log(f"[TELEGRAM] Message too long ({len(text)} chars), using batching")
-    lines = text.split('\n')
-    if not lines:
-        return True
-    
-    # First line is header, rest is content
-    header = lines[0]
-    content_lines = lines[1:]
-    
-    success, results = batch_send_message(tok, chat, header, content_lines)
+    # Message is too long - batch the lines directly (no full join/re-split)
+    debug_log(f"[TELEGRAM] Message too long ({text_len} chars), using batching")
+    success, results = batch_send_message(tok, chat, header, lines)
     
     if not success:
         debug_log(f"[TELEGRAM] Some batches failed: {[r for r in results if r[1] < 200 or r[1] >= 300]}")
@@ -137,7 +132,7 @@ def main():
     
     # Load seen cache and calculate TTL (use STATE_DIR)
     seen_cache_path = STATE_DIR / "seen.json"
-    seen = load_seen(str(seen_cache_path))
+    seen = load_seen(str(seen_cache_path), SEEN_TTL_DAYS)
     ttl_seconds = SEEN_TTL_DAYS * 24 * 3600
     now_epoch = int(time.time())
     
@@ -250,13 +245,12 @@ def main():
     
     if final_entries:
         # Sort final entries by company name alphabetically, then by timestamp desc
-        final_entries.sort(key=lambda x: (x["line"].split(" — ")[0].replace("• ", "").lower(), -x["ts"]))
+        final_entries.sort(key=lambda x: (x["company_lower"], -x["ts"]))
         header = f"🔔 DM Alert: New internships detected ({len(final_entries)})"
         lines = [entry["line"] for entry in final_entries]
-        message = "\n".join([header] + lines)
         
         debug_log(f"[SEND] Sending message with {len(lines)} lines, ttl_allowed={len(final_entries)}")
-        sent_ok = send_telegram(message)
+        sent_ok = send_telegram(header, lines)
         if sent_ok:
             # Mark as seen only after successful send
             for entry in final_entries:
@@ -5,6 +5,7 @@ Handles commit processing and entry detection for repository monitoring.
 """
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
 from github_helper import debug_log
 from repo_utils import get_repo_entries, commit_detail, get_file_at, watched
 from job_filtering import should_process_repo_item
@@ -46,6 +47,7 @@ def process_repo_entries(repo, listings_path, last_seen_sha, watch_paths,
     
     # Accumulate new entries from all commits
     all_new_entries = []
+    watch_prefixes = tuple(watch_paths)
     for c in reversed(new):  # oldest→newest
         sha = c["sha"]
         parent = c["parents"][0]["sha"] if c["parents"] else None
@@ -53,7 +55,7 @@ def process_repo_entries(repo, listings_path, last_seen_sha, watch_paths,
         
         files = [f["filename"] for f in commit_detail(repo, sha).get("files", [])]
         # Only react if any watched path changed in this commit
-        watched_files = [f for f in files if watched(f, watch_paths)]
+        watched_files = [f for f in files if watched(f, watch_prefixes)]
         
         if not watched_files:
             debug_log(f"[DELTA] {repo} → commit {sha[:8]} has no watched files (files: {files[:3]}...)")
@@ -61,9 +63,13 @@ def process_repo_entries(repo, listings_path, last_seen_sha, watch_paths,
         
         debug_log(f"[DELTA] {repo} → commit {sha[:8]} changed watched files: {watched_files}")
         
-        # Fetch listings file content at before/after refs
-        after_txt = get_file_at(repo, sha, listings_path)
-        before_txt = get_file_at(repo, parent, listings_path) if parent else None
+        # Fetch listings file content at before/after refs concurrently; each is a
+        # multi-MB download, so overlapping them roughly halves the per-commit wait
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            after_future = pool.submit(get_file_at, repo, sha, listings_path)
+            before_future = pool.submit(get_file_at, repo, parent, listings_path) if parent else None
+            after_txt = after_future.result()
+            before_txt = before_future.result() if before_future else None
         
         try:
             after = json.loads(after_txt) if after_txt else []
@@ -74,7 +80,8 @@ def process_repo_entries(repo, listings_path, last_seen_sha, watch_paths,
             continue
         
         # Find new entries in this commit
-        before_keys = {get_dedup_key(x) for x in before if get_dedup_key(x) and should_include_item(x)}
+        # Compute each item's key once (previously evaluated twice per item)
+        before_keys = {key for x in before if should_include_item(x) and (key := get_dedup_key(x))}
         commit_new_count = 0
         commit_window_count = 0
         commit_category_count = 0
@@ -121,6 +128,7 @@ def process_repo_entries(repo, listings_path, last_seen_sha, watch_paths,
                             all_new_entries.append({
                                 "key": key,
                                 "line": line,
+                                "company_lower": (company or "").lower(),  # sort key for the DM message
                                 "ts": ts,
                                 "repo": repo,
                                 "item": item